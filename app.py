@@ -11,7 +11,6 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import plotly.graph_objects as go
-import plotly.express as px
 
 # --- CONFIGURATION DE LA PÁGINA ---
 st.set_page_config(
@@ -43,19 +42,117 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- DATOS DE EJEMPLO ---
-@st.cache_data
+# cache_resource: un único DataFrame compartido por referencia, sin copia por acceso.
+# Los consumidores solo lo leen; nunca lo modifican en sitio.
+@st.cache_resource
 def load_sample_data():
     """Carga datos de ejemplo para las visualizaciones"""
-    dates = pd.date_range(start='2023-01-01', end='2024-12-31', freq='D')
+    # Un solo generador con semilla fija: datos reproducibles entre reinicios
+    rng = np.random.default_rng(42)
+    dates = np.arange('2023-01-01', '2025-01-01', dtype='datetime64[D]')
+    n = len(dates)
     data = {
         'date': dates,
-        'ev_sales': np.random.randint(100, 500, len(dates)),
-        'market_share': np.random.uniform(10, 50, len(dates)),
-        'avg_price': np.random.uniform(30000, 80000, len(dates))
+        'ev_sales': rng.integers(100, 500, n, dtype=np.int32),
+        'market_share': rng.uniform(10, 50, n).astype(np.float32),
+        'avg_price': rng.uniform(30000, 80000, n).astype(np.float32),
+        # Código de mes precalculado (0 = primer mes) para agregaciones mensuales
+        'month_code': (
+            dates.astype('datetime64[M]') - dates[0].astype('datetime64[M]')
+        ).astype(np.int16)
     }
     return pd.DataFrame(data)
 
+@st.cache_data
+def load_sample_kpis():
+    """KPIs de la portada calculados una sola vez sobre los datos de ejemplo"""
+    df = load_sample_data()
+    return {
+        'total_sales': int(df['ev_sales'].to_numpy().sum()),
+        'mean_share': float(df['market_share'].to_numpy().mean()),
+        'mean_price': float(df['avg_price'].to_numpy().mean()),
+    }
+
+@st.cache_data
+def sample_preview(n=10):
+    """Primeras filas listas para mostrar: sin columnas auxiliares y con 2 decimales"""
+    head = load_sample_data().head(n).drop(columns='month_code')
+    # float64 antes de redondear: en float32 40.97 se mostraría como 40.970001
+    return head.astype({'market_share': np.float64, 'avg_price': np.float64}).round(2)
+
+# --- REDUCCION DE PUNTOS PARA GRAFICOS ---
+MAX_PLOT_POINTS = 500
+
+def lttb_indices(y, n_out):
+    """Índices Largest-Triangle-Three-Buckets: conserva la forma visual con n_out puntos"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64)
+    # n_out - 2 buckets interiores; el primer y el último punto se conservan siempre
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+@st.cache_data
+def load_plot_series(column, n_out=MAX_PLOT_POINTS):
+    """Serie diaria reducida con LTTB para no enviar todos los puntos al navegador"""
+    df = load_sample_data()
+    idx = lttb_indices(df[column].to_numpy(), n_out)
+    return df[['date', column]].iloc[idx].reset_index(drop=True)
+
 # --- PAGINA PRINCIPAL ---
+@st.cache_data
+def home_trend_figs():
+    """Figuras de tendencias de la portada, construidas una vez y devueltas como dict"""
+    # Gráfico de vendidas
+    sales = load_plot_series('ev_sales')
+    fig1 = go.Figure()
+    fig1.add_trace(go.Scattergl(
+        x=sales['date'],
+        y=sales['ev_sales'],
+        mode='lines',
+        name='Ventas EV',
+        line=dict(color='#1f77b4')
+    ))
+    fig1.update_layout(
+        title="Ventas de VE en el Tiempo",
+        xaxis_title="Fecha",
+        yaxis_title="Ventas (unidades)",
+        template="plotly_white"
+    )
+    
+    # Gráfico de market share
+    share = load_plot_series('market_share')
+    fig2 = go.Figure()
+    fig2.add_trace(go.Scattergl(
+        x=share['date'],
+        y=share['market_share'],
+        mode='lines',
+        name='Market Share',
+        line=dict(color='#ff7f0e')
+    ))
+    fig2.update_layout(
+        title="Market Share de VE",
+        xaxis_title="Fecha",
+        yaxis_title="Market Share (%)",
+        template="plotly_white"
+    )
+    return fig1.to_dict(), fig2.to_dict()
+
 def page_home():
     st.title("🚗 EV Market Intelligence Suite")
     st.markdown("""---""")
@@ -72,25 +169,25 @@ def page_home():
     st.markdown("---")
     st.subheader("Datos de Ejemplo")
     
-    df = load_sample_data()
+    kpis = load_sample_kpis()
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric(
             label="Total Ventas EV",
-            value=f"{df['ev_sales'].sum():,}",
+            value=f"{kpis['total_sales']:,}",
             delta="+12.5%"
         )
     with col2:
         st.metric(
             label="Promedio Market Share",
-            value=f"{df['market_share'].mean():.1f}%",
+            value=f"{kpis['mean_share']:.1f}%",
             delta="+2.3%"
         )
     with col3:
         st.metric(
             label="Precio Promedio",
-            value=f"${df['avg_price'].mean():,.0f}",
+            value=f"${kpis['mean_price']:,.0f}",
             delta="-3.2%"
         )
     with col4:
@@ -104,45 +201,17 @@ def page_home():
     
     col1, col2 = st.columns(2)
     
+    fig1, fig2 = home_trend_figs()
+    
     with col1:
-        # Gráfico de vendidas
-        fig1 = go.Figure()
-        fig1.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['ev_sales'],
-            mode='lines',
-            name='Ventas EV',
-            line=dict(color='#1f77b4')
-        ))
-        fig1.update_layout(
-            title="Ventas de VE en el Tiempo",
-            xaxis_title="Fecha",
-            yaxis_title="Ventas (unidades)",
-            template="plotly_white"
-        )
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        # Gráfico de market share
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['market_share'],
-            mode='lines',
-            name='Market Share',
-            line=dict(color='#ff7f0e')
-        ))
-        fig2.update_layout(
-            title="Market Share de VE",
-            xaxis_title="Fecha",
-            yaxis_title="Market Share (%)",
-            template="plotly_white"
-        )
         st.plotly_chart(fig2, use_container_width=True)
     
     st.markdown("---")
     st.subheader("Primeras 10 Filas de Datos")
-    st.dataframe(df.head(10), use_container_width=True)
+    st.table(sample_preview(10))
     
     st.markdown("---")
     st.info(
@@ -151,17 +220,17 @@ def page_home():
     )
 
 # --- PAGINA MACRO ---
-def page_macro():
-    st.title("🌐 Análisis Macro")
-    st.markdown("Análisis de tendencias globales del mercado de VE")
-    
+@st.cache_data
+def macro_fig():
+    """Figura de ventas mensuales construida una sola vez; se reutiliza su dict"""
     df = load_sample_data()
-    monthly_sales = df.set_index('date').resample('M')['ev_sales'].sum()
+    sums = np.bincount(df['month_code'].to_numpy(), weights=df['ev_sales'].to_numpy())
+    months = df['date'].to_numpy()[0].astype('datetime64[M]') + np.arange(sums.size)
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=monthly_sales.index,
-        y=monthly_sales.values,
+        x=months,
+        y=sums.astype(np.int64),
         name='Ventas Mensuales',
         marker=dict(color='#2ca02c')
     ))
@@ -171,55 +240,87 @@ def page_macro():
         yaxis_title="Ventas (unidades)",
         template="plotly_white"
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_dict()
+
+def page_macro():
+    st.title("🌐 Análisis Macro")
+    st.markdown("Análisis de tendencias globales del mercado de VE")
+    
+    st.plotly_chart(macro_fig(), use_container_width=True)
     
     st.success("✅ Módulo de Análisis Macro operacional")
 
 # --- PAGINA BENCHMARK ---
+@st.cache_data
+def benchmark_figs(benchmark_data):
+    """Construye las figuras de Benchmark una sola vez; devuelve sus dicts para reutilizar"""
+    import plotly.express as px
+    
+    benchmark_df = pd.DataFrame(benchmark_data)
+    fig_pie = px.pie(
+        benchmark_df,
+        values='Market Share',
+        names='Competidor',
+        title="Market Share por Competidor"
+    )
+    fig_bar = px.bar(
+        benchmark_df,
+        x='Competidor',
+        y='Modelos',
+        title="Número de Modelos por Competidor",
+        color='Modelos'
+    )
+    return fig_pie.to_dict(), fig_bar.to_dict()
+
 def page_benchmark():
     st.title("🏆 Benchmark")
     st.markdown("Comparación de competidores y modelos")
     
-    df = load_sample_data()
-    
     benchmark_data = {
         'Competidor': ['Tesla', 'BYD', 'VW', 'Hyundai', 'GM'],
         'Market Share': [28, 32, 12, 8, 7],
         'Modelos': [5, 12, 8, 6, 4]
     }
-    benchmark_df = pd.DataFrame(benchmark_data)
+    fig_pie, fig_bar = benchmark_figs(benchmark_data)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.pie(
-            benchmark_df,
-            values='Market Share',
-            names='Competidor',
-            title="Market Share por Competidor"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_pie, use_container_width=True)
     
     with col2:
-        fig = px.bar(
-            benchmark_df,
-            x='Competidor',
-            y='Modelos',
-            title="Número de Modelos por Competidor",
-            color='Modelos'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_bar, use_container_width=True)
     
-    st.dataframe(benchmark_df, use_container_width=True)
+    st.dataframe(benchmark_data, use_container_width=True)
     st.success("✅ Módulo de Benchmark operacional")
 
 # --- PAGINA DEEP DIVE ---
+@st.cache_data
+def deep_dive_figs(segment):
+    """Figuras del segmento, cacheadas por segmento y devueltas como dict"""
+    import plotly.express as px
+    
+    fig_price = px.line(
+        load_plot_series('avg_price'),
+        x='date',
+        y='avg_price',
+        title=f"Precio Promedio - {segment}",
+        render_mode='webgl'
+    )
+    fig_share = px.area(
+        load_plot_series('market_share'),
+        x='date',
+        y='market_share',
+        title=f"Market Share - {segment}"
+    )
+    return fig_price.to_dict(), fig_share.to_dict()
+
+# Fragmento: cambiar de segmento solo re-ejecuta esta página, no toda la app
+@st.fragment
 def page_deep_dive():
     st.title("🔍 Deep Dive Analysis")
     st.markdown("Análisis profundo por segmento")
     
-    df = load_sample_data()
-    
     segment = st.selectbox(
         "Selecciona un segmento:",
         ["Sedanes", "SUVs", "Hatchbacks", "Camionetas"]
@@ -229,23 +330,13 @@ def page_deep_dive():
     
     col1, col2 = st.columns(2)
     
+    fig_price, fig_share = deep_dive_figs(segment)
+    
     with col1:
-        fig = px.line(
-            df,
-            x='date',
-            y='avg_price',
-            title=f"Precio Promedio - {segment}"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_price, use_container_width=True)
     
     with col2:
-        fig = px.area(
-            df,
-            x='date',
-            y='market_share',
-            title=f"Market Share - {segment}"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_share, use_container_width=True)
     
     st.info(f"🛠️  Mostrando datos para {segment}")
     st.success("✅ Módulo Deep Dive operacional")
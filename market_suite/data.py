@@ -9,10 +9,12 @@ Previously in: app.py (monolithic)
 from __future__ import annotations
 import os
 import io
+import re
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from urllib.request import urlopen, Request
+import pyarrow.parquet as pq
 import streamlit as st
 
 # =============================================================================
@@ -37,15 +39,156 @@ CANON_COLS = {
     "PRECIO_LISTA": "precio_lista",
 }
 
+# Low-cardinality text columns stored as category (non-canonical
+# columns keep their source names)
+TEXT_COLS = ["marca", "marca_generica", "modelo", "EMPRESA", "COMBUSTIBLE", "CARROCERIA"]
+
+# Money columns downcast to float32 once the data is deduplicated
+MONEY_COLS = ["VALOR US$ CIF", "FLETE"]
+
+# Currency symbols and spaces stripped before numeric coercion
+_NUMBER_TRANS = str.maketrans({"$": "", "₡": "", " ": ""})
+# EU-formatted cell: dot thousands with a comma decimal (1.234,56), several
+# dot groups (1.234.567), or a bare decimal comma whose digit count rules out
+# thousands (12,5 / 1234,56). A lone "12.345" stays a decimal.
+_RE_EU_NUMBER = re.compile(
+    r"-?(?:\d{1,3}(?:(?:\.\d{3})+,\d+|(?:\.\d{3}){2,})|\d+,(?:\d{1,2}|\d{4,}))"
+)
+# US-formatted cell: comma thousands with an optional dot decimal (1,234.56)
+_RE_US_NUMBER = re.compile(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+
+# =============================================================================
+# TYPE COERCION
+# =============================================================================
+
+def to_number_series(s: pd.Series) -> pd.Series:
+    """
+    Coerce a series to numeric, stripping currency symbols and separators.
+    
+    Already-numeric columns (the common case for parquet inputs) are returned
+    as-is. Text cells are checked one by one: EU-formatted cells drop their
+    dots and use the comma as decimal point, US-formatted cells drop their
+    commas. Any other cell containing a comma is ambiguous and becomes NaN.
+    
+    Args:
+        s: Input series
+    
+    Returns:
+        Numeric series (unparseable values become NaN)
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    
+    s2 = s.astype(str).str.translate(_NUMBER_TRANS)
+    
+    # Per-cell format detection, done before any separator is removed
+    eu = s2.str.fullmatch(_RE_EU_NUMBER).fillna(False).astype(bool)
+    us = s2.str.fullmatch(_RE_US_NUMBER).fillna(False).astype(bool)
+    out = s2.copy()
+    if us.any():
+        out[us] = s2[us].str.replace(",", "", regex=False)
+    if eu.any():
+        out[eu] = (
+            s2[eu].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        )
+    
+    return pd.to_numeric(out, errors="coerce")
+
+
+def to_year_series(s: pd.Series) -> pd.Series:
+    """
+    Coerce a year column to nullable Int16 (2 bytes per row instead of 8).
+    
+    Args:
+        s: Input series
+    
+    Returns:
+        Int16 series (unparseable or out-of-range values become <NA>)
+    """
+    years = to_number_series(s).round()
+    # Sentinels/typos (e.g. 99999) would overflow int16 and fail the cast
+    return years.where(years.between(1900, 2100)).astype("Int16")
+
+
+def text_cols_to_category(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert TEXT_COLS present in the dataframe to category dtype (in place).
+    
+    Groupbys and isin filters then work on integer codes instead of
+    hashing Python strings.
+    
+    Args:
+        df: Input dataframe
+    
+    Returns:
+        The same dataframe, for chaining
+    """
+    for col in TEXT_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
 # =============================================================================
 # DATA LOADING
 # =============================================================================
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_parquet_from_local(path: str, mtime: float) -> pd.DataFrame:
+    """
+    Read and normalize a local parquet file.
+    
+    Cached on (path, mtime): reruns reuse the normalized frame and the
+    cache is only rebuilt when the file changes on disk. Only the latest
+    version is kept, so a stale frame is evicted instead of lingering.
+    
+    The frame is shared by reference across sessions (no per-session
+    pickle copy), so callers must treat it as read-only.
+    
+    Args:
+        path: Parquet file path
+        mtime: File modification time (cache key only)
+    
+    Returns:
+        pd.DataFrame: Loaded and normalized data
+    """
+    # All columns are read: etl_clean deduplicates on full rows, so dropping
+    # identifying columns (NUMERO SERIE, DISTRIBUIDOR...) would merge records.
+    # Text dimensions decode straight into categoricals (dictionary arrays)
+    # instead of materializing one Python string per row
+    available = pq.read_schema(path).names
+    dictionary_cols = [c for c in available if CANON_COLS.get(c, c) in TEXT_COLS]
+    df = pd.read_parquet(
+        path,
+        engine="pyarrow",
+        read_dictionary=dictionary_cols or None,
+    )
+    
+    # Normalize columns
+    df = df.rename(columns=CANON_COLS)
+    
+    # Ensure data types
+    if "fecha" in df.columns:
+        df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    if "precio" in df.columns:
+        df["precio"] = to_number_series(df["precio"])
+    if "año" in df.columns:
+        df["año"] = to_year_series(df["año"])
+    if "CANTIDAD" in df.columns:
+        # Unit counts: int32 halves the bytes every groupby-sum moves
+        df["CANTIDAD"] = to_number_series(df["CANTIDAD"]).fillna(0).round().astype(np.int32)
+    for col in MONEY_COLS:
+        if col in df.columns:
+            # Full precision here: etl_clean deduplicates before downcasting
+            df[col] = to_number_series(df[col])
+    
+    return df
+
+
 def load_data_flow() -> pd.DataFrame | None:
     """
     Load data from local parquet file.
-    Cached for 1 hour to improve performance.
+    Parsing is cached per file version (see load_parquet_from_local).
     
     Returns:
         pd.DataFrame: Loaded and normalized data, or None if error
@@ -53,18 +196,9 @@ def load_data_flow() -> pd.DataFrame | None:
     try:
         # Load from local parquet (located in repo root)
         if os.path.exists(DEFAULT_LOCAL_PARQUET):
-            df = pd.read_parquet(DEFAULT_LOCAL_PARQUET)
-            
-            # Normalize columns
-            df = df.rename(columns=CANON_COLS)
-            
-            # Ensure data types
-            if "fecha" in df.columns:
-                df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
-            if "precio" in df.columns:
-                df["precio"] = pd.to_numeric(df["precio"], errors="coerce")
-            if "año" in df.columns:
-                df["año"] = pd.to_numeric(df["año"], errors="coerce")
+            df = load_parquet_from_local(
+                DEFAULT_LOCAL_PARQUET, os.path.getmtime(DEFAULT_LOCAL_PARQUET)
+            )
             
             st.success(f"✅ Datos cargados: {len(df):,} registros")
             return df
@@ -105,15 +239,17 @@ def ensure_required_columns(df: pd.DataFrame) -> pd.DataFrame:
         df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
     
     if "precio" in df.columns:
-        df["precio"] = pd.to_numeric(df["precio"], errors="coerce")
+        df["precio"] = to_number_series(df["precio"])
     
     if "año" in df.columns:
-        df["año"] = pd.to_numeric(df["año"], errors="coerce")
+        df["año"] = to_year_series(df["año"])
     
-    # Remove rows with missing critical values
-    for col in required:
-        if col in df.columns:
-            df = df.dropna(subset=[col])
+    text_cols_to_category(df)
+    
+    # Remove rows with missing critical values (single pass)
+    present = [col for col in required if col in df.columns]
+    if present:
+        df = df.dropna(subset=present)
     
     return df
 
@@ -126,6 +262,9 @@ def apply_time_view(
     """
     Filter dataframe by date range.
     
+    The result may be a view (slice) of the input rather than a copy:
+    treat it as read-only or .copy() it before assigning columns.
+    
     Args:
         df: Input dataframe
         start_date: Start date (datetime or similar)
@@ -141,7 +280,14 @@ def apply_time_view(
         start = pd.to_datetime(start_date)
         end = pd.to_datetime(end_date)
         
-        return df[(df["fecha"] >= start) & (df["fecha"] <= end)].copy()
+        fechas = df["fecha"]
+        # Sorted dates (etl_clean output): binary-search the bounds and slice
+        if fechas.is_monotonic_increasing:
+            lo = fechas.searchsorted(start, side="left")
+            hi = fechas.searchsorted(end, side="right")
+            return df.iloc[lo:hi]
+        
+        return df[(fechas >= start) & (fechas <= end)]
     
     except Exception as e:
         st.error(f"Error applying time filter: {str(e)}")
@@ -165,17 +311,28 @@ def etl_clean(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
     
-    df = df.copy()
-    
-    # Remove duplicates
-    df = df.drop_duplicates()
-    
-    # Remove rows where precio is null or 0
+    # Single row mask: precio present and > 0, fecha present
+    keep = pd.Series(True, index=df.index)
     if "precio" in df.columns:
-        df = df[df["precio"].notna() & (df["precio"] > 0)]
+        keep &= df["precio"].notna() & (df["precio"] > 0)
+    if "fecha" in df.columns:
+        keep &= df["fecha"].notna()
     
-    # Remove rows where fecha is null
+    # Masking and drop_duplicates return new frames, so the input is
+    # never mutated and no upfront full copy is needed
+    df = df[keep].drop_duplicates()
+    
+    # Keep rows date-ordered so apply_time_view can slice instead of masking
     if "fecha" in df.columns:
-        df = df[df["fecha"].notna()]
+        df = df.sort_values("fecha", kind="stable", ignore_index=True)
+    else:
+        df = df.reset_index(drop=True)
+    
+    # Money amounts: float32 keeps ~7 significant digits at half the size.
+    # Only after drop_duplicates, so precision never decides which rows survive
+    for col in MONEY_COLS:
+        if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype(np.float32)
     
-    return df.reset_index(drop=True)
+    # Categorical text columns: int codes instead of Python strings
+    return text_cols_to_category(df)
@@ -8,9 +8,9 @@ Previously in: app.py (monolithic)
 
 from __future__ import annotations
 from datetime import datetime
-from typing import Dict, List
+from functools import lru_cache
 import pandas as pd
-from fpdf import FPDF
+from fpdf import FPDF, FontFace, XPos, YPos
 import streamlit as st
 
 
@@ -31,11 +31,21 @@ def human_money(x: float) -> str:
 
 
 def pdf_sanitize(text) -> str:
-    """Sanitize text for FPDF (latin-1 encoding)."""
+    """Sanitize text for FPDF core fonts (latin-1 encoding)."""
+    # Memoize on the string form: equal keys like 1.0 and True must not collide
+    return _sanitize_str(str(text))
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_str(text: str) -> str:
+    """Memoized latin-1 replacement for an already-stringified value."""
+    # ASCII is already latin-1 safe: skip the encode/decode round-trip
+    if text.isascii():
+        return text
     try:
-        return str(text).encode("latin-1", "replace").decode("latin-1")
+        return text.encode("latin-1", "replace").decode("latin-1")
     except Exception:
-        return str(text)
+        return text
 
 
 # ==============================================================================
@@ -48,7 +58,10 @@ class ExecutivePDF(FPDF):
     def header(self):
         self.set_font("Helvetica", "B", 13)
         self.set_text_color(30, 55, 153)
-        self.cell(0, 8, "Reporte de Inteligencia de Mercado - Automotriz", 0, 1, "C")
+        self.cell(
+            0, 8, "Reporte de Inteligencia de Mercado - Automotriz",
+            align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT,
+        )
         self.ln(2)
     
     def footer(self):
@@ -56,20 +69,26 @@ class ExecutivePDF(FPDF):
         self.set_font("Helvetica", "I", 8)
         self.set_text_color(120)
         fecha_gen = datetime.now().strftime("%Y-%m-%d %H:%M")
-        self.cell(0, 10, f"Pag {self.page_no()} | Generado {fecha_gen} | Confidencial", 0, 0, "C")
+        self.cell(
+            0, 10, f"Pag {self.page_no()} | Generado {fecha_gen} | Confidencial",
+            align="C", new_x=XPos.RIGHT, new_y=YPos.TOP,
+        )
 
 
 # ==============================================================================
 # PDF BUILDER
 # ==============================================================================
 
-@st.cache_data(show_spinner=False)
-def build_pdf_bytes(df_dict: Dict[str, List], title: str, subtitle: str, view_mode: str) -> bytes:
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_pdf_bytes(df: pd.DataFrame, title: str, subtitle: str, view_mode: str) -> bytes:
     """
-    Build executive PDF report from dataframe dict.
+    Build executive PDF report from a dataframe.
+    
+    The frame is hashed natively by st.cache_data, so callers pass it
+    directly instead of converting it to a dict of lists first.
     
     Args:
-        df_dict: DataFrame as dict (from df.to_dict(orient='list'))
+        df: Filtered dataframe (only read, never mutated)
         title: Report title
         subtitle: Report subtitle/description
         view_mode: "Full Year" or "YTD"
@@ -77,17 +96,19 @@ def build_pdf_bytes(df_dict: Dict[str, List], title: str, subtitle: str, view_mo
     Returns:
         PDF bytes ready for download
     """
-    df = pd.DataFrame(df_dict)
     pdf = ExecutivePDF(orientation="P", unit="mm", format="A4")
     pdf.add_page()
     
     # Title block
     pdf.set_font("Helvetica", "B", 16)
     pdf.set_text_color(0)
-    pdf.cell(0, 10, pdf_sanitize(title), 0, 1, "L")
+    pdf.cell(0, 10, pdf_sanitize(title), align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("Helvetica", "I", 10)
     pdf.set_text_color(90)
-    pdf.cell(0, 7, pdf_sanitize(f"Vista Temporal: {view_mode} | {subtitle}"), 0, 1, "L")
+    pdf.cell(
+        0, 7, pdf_sanitize(f"Vista Temporal: {view_mode} | {subtitle}"),
+        align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT,
+    )
     pdf.ln(3)
     
     # Executive KPIs box
@@ -98,12 +119,24 @@ def build_pdf_bytes(df_dict: Dict[str, List], title: str, subtitle: str, view_mo
     pdf.set_fill_color(245, 245, 245)
     pdf.set_draw_color(220, 220, 220)
     pdf.rect(10, 40, 190, 20, "FD")
+    # Restore FPDF's default fill: fpdf2 tables take any non-default fill
+    # colour as the background of every cell, not just the striped rows
+    pdf.set_fill_color(pdf.DEFAULT_FILL_COLOR)
     pdf.set_y(45)
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_text_color(0)
-    pdf.cell(63, 8, pdf_sanitize(f"Volumen: {total_vol:,.0f}"), 0, 0, "C")
-    pdf.cell(63, 8, pdf_sanitize(f"Inversión: {human_money(total_val)}"), 0, 0, "C")
-    pdf.cell(63, 8, pdf_sanitize(f"Ticket: {human_money(ticket)}"), 0, 1, "C")
+    pdf.cell(
+        63, 8, pdf_sanitize(f"Volumen: {total_vol:,.0f}"),
+        align="C", new_x=XPos.RIGHT, new_y=YPos.TOP,
+    )
+    pdf.cell(
+        63, 8, pdf_sanitize(f"Inversión: {human_money(total_val)}"),
+        align="C", new_x=XPos.RIGHT, new_y=YPos.TOP,
+    )
+    pdf.cell(
+        63, 8, pdf_sanitize(f"Ticket: {human_money(ticket)}"),
+        align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT,
+    )
     pdf.ln(10)
     
     # Main ranking
@@ -117,41 +150,62 @@ def build_pdf_bytes(df_dict: Dict[str, List], title: str, subtitle: str, view_mo
     else:
         group = "AÑO" if "AÑO" in df.columns else None
     
-    if group is not None and group in df.columns and "CANTIDAD" in df.columns:
-        pdf.cell(0, 8, pdf_sanitize(f"Top 15 por {group}"), 0, 1, "L")
+    # Single pass over the raw rows; both rankings are derived from this cube
+    agg = None
+    if "CANTIDAD" in df.columns:
+        keys = [c for c in dict.fromkeys((group, "EMPRESA")) if c is not None and c in df.columns]
+        if keys:
+            agg = (
+                df[keys + ["CANTIDAD"]]
+                .groupby(keys, observed=True, sort=False, dropna=False)["CANTIDAD"]
+                .sum()
+            )
+    
+    if group is not None and group in df.columns and agg is not None:
+        pdf.cell(
+            0, 8, pdf_sanitize(f"Top 15 por {group}"),
+            align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT,
+        )
         pdf.ln(1)
-        top = df.groupby(group)["CANTIDAD"].sum().sort_values(ascending=False).head(15)
-        
-        pdf.set_font("Helvetica", "B", 9)
-        pdf.set_text_color(255)
-        pdf.set_fill_color(44, 62, 80)
-        pdf.cell(140, 7, pdf_sanitize(group), 1, 0, "L", 1)
-        pdf.cell(50, 7, "Unidades", 1, 1, "R", 1)
+        top = agg.groupby(level=group, observed=True, sort=False).sum().nlargest(15)
         
         pdf.set_font("Helvetica", "", 9)
         pdf.set_text_color(0)
-        alt = False
-        for name, val in top.items():
-            pdf.set_fill_color(240, 240, 240) if alt else pdf.set_fill_color(255, 255, 255)
-            pdf.cell(140, 7, pdf_sanitize(str(name))[:65], 1, 0, "L", alt)
-            pdf.cell(50, 7, pdf_sanitize(f"{val:,.0f}"), 1, 1, "R", alt)
-            alt = not alt
+        with pdf.table(
+            width=190,
+            col_widths=(140, 50),
+            line_height=7,
+            text_align=("LEFT", "RIGHT"),
+            headings_style=FontFace(emphasis="BOLD", color=255, fill_color=(44, 62, 80)),
+            cell_fill_color=240,
+            cell_fill_mode="EVEN_ROWS",
+        ) as table:
+            table.row((pdf_sanitize(group), "Unidades"))
+            for name, val in top.items():
+                table.row((pdf_sanitize(str(name))[:65], pdf_sanitize(f"{val:,.0f}")))
     else:
         pdf.set_font("Helvetica", "", 10)
         pdf.set_text_color(0)
         pdf.multi_cell(0, 6, pdf_sanitize("No hay columnas suficientes para construir un ranking."))
     
     # Importers block
-    if "EMPRESA" in df.columns and "CANTIDAD" in df.columns:
+    if "EMPRESA" in df.columns and agg is not None:
         pdf.ln(6)
         pdf.set_font("Helvetica", "B", 12)
         pdf.set_text_color(30, 55, 153)
-        pdf.cell(0, 8, "Top 5 Importadores", 0, 1, "L")
-        top_imp = df.groupby("EMPRESA")["CANTIDAD"].sum().sort_values(ascending=False).head(5)
+        pdf.cell(0, 8, "Top 5 Importadores", align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        top_imp = agg.groupby(level="EMPRESA", observed=True, sort=False).sum().nlargest(5)
         pdf.set_font("Helvetica", "", 10)
         pdf.set_text_color(0)
-        for name, val in top_imp.items():
-            pdf.cell(140, 6, pdf_sanitize(f"- {name}")[:80], 0, 0, "L")
-            pdf.cell(50, 6, pdf_sanitize(f"{val:,.0f}"), 0, 1, "R")
+        with pdf.table(
+            width=190,
+            col_widths=(140, 50),
+            line_height=6,
+            text_align=("LEFT", "RIGHT"),
+            borders_layout="NONE",
+            first_row_as_headings=False,
+        ) as table:
+            for name, val in top_imp.items():
+                table.row((pdf_sanitize(f"- {name}")[:80], pdf_sanitize(f"{val:,.0f}")))
     
-    return pdf.output(dest="S").encode("latin-1")
+    return bytes(pdf.output())